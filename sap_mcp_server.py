@@ -1,13 +1,45 @@
 import os
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+from aiolimiter import AsyncLimiter
+from async_lru import alru_cache
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 import aiohttp
-import json
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+import orjson
 import asyncio
+import functools
+import random
+import ssl
+import time
+import urllib.parse
 
-# Load environment variables
-load_dotenv()
+class SAPError(Exception):
+    """Base class for errors returned by the SAP tools."""
+
+class SAPTransientError(SAPError):
+    """SAP could not be reached or was temporarily unavailable; safe to retry."""
+
+class SAPUncertainError(SAPError):
+    """A create request failed after SAP may already have processed it; check before retrying."""
+
+class SAPBadResponseError(SAPError):
+    """SAP answered with an unexpected status."""
+    
+    def __init__(self, status: int, body: str = ""):
+        super().__init__(f"SAP API request failed with status {status}: {body}")
+        self.status = status
+        self.body = body
+
+class SAPAuthError(SAPBadResponseError):
+    """SAP rejected the credentials or CSRF token (401/403)."""
+
+# Load environment variables from .env only when run as the server; the
+# module-level settings below are read right after this
+if __name__ == "__main__":
+    load_dotenv()
 
 # Initialize FastMCP
 app = FastMCP(name="SAP MCP Server", port=3001)
@@ -16,74 +48,360 @@ app = FastMCP(name="SAP MCP Server", port=3001)
 SAP_BASE_URL = "https://ed9.enstrapp.com:8200/sap/opu/odata/sap/ZEMT_PMAPP_SRV"
 ENDPOINT = "/DueNotificationSet"
 
+# Due notification URL with the default query options already encoded
+_FETCH_URL = URL(f"{SAP_BASE_URL}{ENDPOINT}").with_query({
+    "$format": "json",
+    "sap-language": "EN",
+    "sap-client": "800"
+})
+
+# Static request headers, built once and shared by every call
+_HEADERS_DUNOT = CIMultiDictProxy(CIMultiDict({
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",  # SAP Gateway only compresses on request
+    "Content-Type": "application/json;charset=UTF-8",
+    "IvUser": "ENST1",
+    "IvTransmitType": "LOAD",
+    "Muser": "ENST1",
+    "Deviceid": "546546",
+    "Udid": "6564",
+    "Operation": "DUNOT"
+}))
+
+_HEADERS_CSRF_FETCH = CIMultiDictProxy(CIMultiDict({
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "x-csrf-token": "fetch",
+    "sap-client": "800"
+}))
+
+# Create headers; the CSRF token and any caller overrides are added per call
+_HEADERS_CREATE_BASE = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "IvUser": "ENST1",
+    "Muser": "ENST1",
+    "Deviceid": "546546",
+    "Udid": "6564",
+    "Operation": "CRNOT",
+    "sap-client": "800"
+}
+
+# TLS context shared by all connections so sessions can be resumed. SAP's
+# certificate is only verified when a CA bundle is configured
+SAP_CA_FILE = os.getenv("SAP_CA_FILE")
+_SSL_CTX = ssl.create_default_context(cafile=SAP_CA_FILE)
+if not SAP_CA_FILE:
+    _SSL_CTX.check_hostname = False
+    _SSL_CTX.verify_mode = ssl.CERT_NONE
+
+# Shared HTTP session, created lazily on first use so every tool call reuses
+# the same keep-alive connection pool to the SAP host
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+# Cap on concurrent outbound requests to SAP, shared by all tool calls
+CONCURRENT_REQUEST_LIMIT = int(os.getenv("SAP_MAX_CONCURRENCY", "16"))
+_sap_sem = asyncio.Semaphore(CONCURRENT_REQUEST_LIMIT)
+
+# Concurrent lookups per get_notifications_bulk call, below the global cap
+# so a single bulk call leaves room for other tool calls
+BULK_CONCURRENCY = 8
+
+# Request rate towards SAP; a low X-RateLimit-Remaining pauses all requests
+# until the advertised reset
+REQUESTS_PER_SECOND = int(os.getenv("SAP_RPS", "10"))
+RATE_LIMIT_LOW_WATERMARK = 1
+_limiter = AsyncLimiter(max_rate=REQUESTS_PER_SECOND, time_period=1)
+_rate_limit_resume_at = 0.0  # time.monotonic() value
+
+# Transient SAP failures that are retried with exponential backoff
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Statuses where SAP has not processed the request, so even a create can be resent
+NON_IDEMPOTENT_RETRY_STATUSES = frozenset({429, 503})
+MAX_RETRY_DELAY = 30  # seconds
+
+# Largest response body accepted from SAP, guards against huge $expand payloads
+MAX_RESPONSE_BYTES = int(os.getenv("SAP_MAX_RESPONSE_BYTES", str(64 * 1024 * 1024)))
+
+# Largest part of an error body included in SAP error messages
+MAX_ERROR_BODY_BYTES = 64 * 1024
+
+# Largest due-notification response kept in the 60 second response cache
+CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+
+# CSRF token and session cookies, reused across create calls until the TTL
+# expires or SAP rejects the token
+CSRF_TOKEN_TTL = 1500  # 25 minutes
+_csrf_cache: Dict[str, Any] = {"token": None, "cookies": None, "ts": 0.0}
+_csrf_lock = asyncio.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _get_auth() -> aiohttp.BasicAuth:
+    """Read the SAP credentials once so tool calls don't re-encode them."""
+    username = os.getenv("SAP_USERNAME")
+    password = os.getenv("SAP_PASSWORD")
+    
+    if not username or not password:
+        raise ValueError("SAP credentials not found in environment variables")
+    
+    return aiohttp.BasicAuth(username, password)
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared SAP client session, creating it if needed."""
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+    async with _session_lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=32,
+                    # Resolve through c-ares and cache lookups of the SAP host
+                    resolver=aiohttp.AsyncResolver(),
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    ssl=_SSL_CTX,
+                    keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=60),  # 60 second timeout
+                # CSRF cookies are passed explicitly, so don't accumulate SAP cookies
+                cookie_jar=aiohttp.DummyCookieJar()
+            )
+        return _session
+
+async def _close_session() -> None:
+    """Close the shared SAP client session if it was opened."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+async def _throttle() -> None:
+    """Wait for SAP's advertised rate-limit reset and a free token bucket slot."""
+    pause = _rate_limit_resume_at - time.monotonic()
+    if pause > 0:
+        await asyncio.sleep(pause)
+    await _limiter.acquire()
+
+def _note_rate_limit(response: aiohttp.ClientResponse) -> None:
+    """Pause further requests when SAP reports its rate limit is nearly used up."""
+    global _rate_limit_resume_at
+    remaining = response.headers.get("X-RateLimit-Remaining", "")
+    reset = response.headers.get("X-RateLimit-Reset", "")
+    if not remaining.isdigit() or not reset.isdigit():
+        return
+    if int(remaining) > RATE_LIMIT_LOW_WATERMARK:
+        return
+    
+    # Reset is either seconds from now or a Unix timestamp
+    reset_in = int(reset)
+    if reset_in > 10 ** 9:
+        reset_in -= time.time()
+    reset_in = min(max(reset_in, 0), MAX_RETRY_DELAY)
+    _rate_limit_resume_at = max(_rate_limit_resume_at, time.monotonic() + reset_in)
+
+@asynccontextmanager
+async def _request_with_retry(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: Union[str, URL],
+    *,
+    max_attempts: int = 3,
+    idempotent: bool = True,
+    **kwargs: Any
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    Send a rate-limited request to SAP, retrying transient failures with
+    exponential backoff.
+    
+    Args:
+        session: Shared client session
+        method: HTTP method
+        url: Request URL
+        max_attempts: Total number of attempts before giving up
+        idempotent: Whether the request may be resent after a connection error
+            or a 502/504, where SAP may already have processed it
+        **kwargs: Passed through to session.request
+    
+    Yields:
+        The final response; retryable statuses are returned as-is once
+        attempts are exhausted
+    
+    Raises:
+        SAPTransientError: If the last attempt of an idempotent request
+            failed to connect
+        SAPUncertainError: If a non-idempotent request failed to connect
+    """
+    retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+    for attempt in range(max_attempts):
+        last_attempt = attempt == max_attempts - 1
+        delay = min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+        async with _sap_sem:
+            await _throttle()
+            try:
+                response = await session.request(method, url, **kwargs)
+            except aiohttp.ClientConnectionError as e:
+                if not idempotent:
+                    raise SAPUncertainError(f"Error connecting to SAP API: {e}") from e
+                if last_attempt:
+                    raise SAPTransientError(f"Error connecting to SAP API: {e}") from e
+            else:
+                _note_rate_limit(response)
+                if response.status not in retry_statuses or last_attempt:
+                    async with response:
+                        yield response
+                    return
+                
+                # Honor the server's backoff hint when it gives one in seconds
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = min(int(retry_after), MAX_RETRY_DELAY)
+                response.release()
+        
+        # Sleep outside the semaphore so other requests can proceed
+        await asyncio.sleep(delay)
+
+async def _read_json_bounded(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+    """Parse a JSON response body, refusing bodies larger than MAX_RESPONSE_BYTES."""
+    return orjson.loads(await _read_bounded(response))
+
+async def _read_bounded(response: aiohttp.ClientResponse) -> bytes:
+    """Read a response body, refusing bodies larger than MAX_RESPONSE_BYTES."""
+    length = response.content_length
+    if length is not None and length > MAX_RESPONSE_BYTES:
+        raise ValueError(f"SAP response of {length} bytes exceeds limit of {MAX_RESPONSE_BYTES} bytes")
+    
+    # Size is known and uncompressed, so reading it in one go is safe
+    if length is not None and not response.headers.get("Content-Encoding"):
+        return await response.read()
+    
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) > MAX_RESPONSE_BYTES:
+            raise ValueError(f"SAP response exceeds limit of {MAX_RESPONSE_BYTES} bytes")
+    return bytes(body)
+
+async def _read_error_text(response: aiohttp.ClientResponse) -> str:
+    """Read the start of an error body, at most MAX_ERROR_BODY_BYTES of it."""
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) >= MAX_ERROR_BODY_BYTES:
+            break
+    return bytes(body[:MAX_ERROR_BODY_BYTES]).decode(response.charset or "utf-8", errors="replace")
+
+async def _check_status(
+    response: aiohttp.ClientResponse,
+    expected: int = 200,
+    idempotent: bool = True
+) -> None:
+    """Raise the matching SAPError if the response status isn't the expected one."""
+    retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+    if not response.ok:
+        # Server error bodies are rarely useful, so don't download them
+        error_text = await _read_error_text(response) if response.status < 500 else ""
+        if response.status in (401, 403):
+            raise SAPAuthError(response.status, error_text)
+        if response.status in retry_statuses:
+            raise SAPTransientError(f"SAP API request failed with status {response.status}")
+        if response.status in RETRY_STATUSES:
+            raise SAPUncertainError(f"SAP API request failed with status {response.status}")
+        raise SAPBadResponseError(response.status, error_text)
+    
+    if response.status != expected:
+        raise SAPBadResponseError(response.status)
+
 @app.tool("fetch_due_notifications")
 async def fetch_due_notifications(
     filter_query: str = "",
-    expand: str = "EvMessage,EtNotifHeader,EtNotifHeader/EtNotifHeaderFields,EtNotifHeader/EtNotifHeaderEquipHistory,EtNotifItems,EtNotifItems/EtNotifItemsFields,EtNotifTasks,EtNotifTasks/EtNotifTasksFields,EtNotifActvs,EtNotifActvs/EtNotifActvsFields,EtNotifLongtext,EtNotifStatus,EtImrg,EtDocs",
+    expand: Optional[List[str]] = None,
+    select: Optional[List[str]] = None,
     format: str = "json",
-    sap_language: str = "EN"
+    sap_language: str = "EN",
+    force_refresh: bool = False
 ) -> Dict[str, Any]:
     """
     Fetch due notifications from SAP OData API with specified filters and expansions.
     
     Args:
         filter_query: OData filter query string
-        expand: Comma-separated list of entities to expand
+        expand: Entities to expand, any of EvMessage, EtNotifHeader,
+            EtNotifHeader/EtNotifHeaderFields, EtNotifHeader/EtNotifHeaderEquipHistory,
+            EtNotifItems, EtNotifItems/EtNotifItemsFields, EtNotifTasks,
+            EtNotifTasks/EtNotifTasksFields, EtNotifActvs, EtNotifActvs/EtNotifActvsFields,
+            EtNotifLongtext, EtNotifStatus, EtImrg, EtDocs (default: none)
+        select: Properties to return (default: all)
         format: Response format (json)
         sap_language: SAP language code
+        force_refresh: Bypass responses cached in the last minute
     
     Returns:
         Dictionary containing the API response
     """
-    # Construct the full URL
-    url = f"{SAP_BASE_URL}{ENDPOINT}"
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json;charset=UTF-8",
-        "IvUser": "ENST1",
-        "IvTransmitType": "LOAD",
-        "Muser": "ENST1",
-        "Deviceid": "546546",
-        "Udid": "6564",
-        "Operation": "DUNOT"
-    }
+    # Lists aren't hashable, so pass them to the cache as tuples
+    args = (
+        filter_query,
+        tuple(expand) if expand else None,
+        tuple(select) if select else None,
+        format,
+        sap_language
+    )
+    if force_refresh:
+        _fetch_cached.cache_invalidate(*args)
+    size, result = await _fetch_cached(*args)
+    if size > CACHE_MAX_ENTRY_BYTES:
+        # Too large to keep around; the cache must not undo MAX_RESPONSE_BYTES
+        _fetch_cached.cache_invalidate(*args)
+    return result
+
+@alru_cache(maxsize=16, ttl=60)
+async def _fetch_cached(
+    filter_query: str,
+    expand: Optional[Tuple[str, ...]],
+    select: Optional[Tuple[str, ...]],
+    format: str,
+    sap_language: str
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Fetch due notifications, caching identical queries for 60 seconds.
     
-    # Prepare query parameters
+    Returns:
+        The raw body size and the parsed response. The parsed dict is shared
+        by every caller that hits the cache, so it must not be modified
+    """
+    # Add only the query options that differ from the prebuilt URL
     params = {
         "$filter": filter_query,
-        "$expand": expand,
-        "$format": format,
-        "sap-language": sap_language,
-        "sap-client": "800"
+        "$expand": ",".join(expand or []),
+        "$select": ",".join(select or [])
     }
+    if format != "json":
+        params["$format"] = format
+    if sap_language != "EN":
+        params["sap-language"] = sap_language
+    params = {key: value for key, value in params.items() if value}
+    url = _FETCH_URL.update_query(params) if params else _FETCH_URL
     
-    # Get credentials from environment variables
-    username = os.getenv("SAP_USERNAME")
-    password = os.getenv("SAP_PASSWORD")
-    
-    if not username or not password:
-        raise ValueError("SAP credentials not found in environment variables")
-    
-    timeout = aiohttp.ClientTimeout(total=60)  # 60 second timeout
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(
-                url,
-                params=params,
-                auth=aiohttp.BasicAuth(username, password),
-                headers=headers,
-                ssl=False  # Note: In production, you should properly handle SSL
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"SAP API request failed with status {response.status}: {error_text}")
-                
-                return await response.json()
-        except asyncio.TimeoutError:
-            raise Exception("Request timed out after 60 seconds")
-        except Exception as e:
-            raise Exception(f"Error making request to SAP API: {str(e)}")
+    session = await _get_session()
+    try:
+        async with _request_with_retry(
+            session,
+            "GET",
+            url,
+            auth=_get_auth(),
+            headers=_HEADERS_DUNOT
+        ) as response:
+            await _check_status(response)
+            
+            body = await _read_bounded(response)
+            return len(body), orjson.loads(body)
+    except asyncio.TimeoutError as e:
+        raise SAPTransientError("Request timed out after 60 seconds") from e
+    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+        raise SAPTransientError(f"Error making request to SAP API: {e}") from e
 
 @app.tool("create_notification")
 async def create_notification(
@@ -109,101 +427,98 @@ async def create_notification(
     # Construct the full URL
     url = f"{SAP_BASE_URL}{ENDPOINT}"
     
-    # Get CSRF token and cookies first
-    csrf_token, cookies = await get_csrf_token()
-    if not csrf_token:
-        raise Exception("Failed to get CSRF token")
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "x-csrf-token": csrf_token,  # Note: Using lowercase as per SAP's requirements
-        "IvUser": notification_data.get("IvUser", "ENST1"),
-        "Muser": notification_data.get("Muser", "ENST1"),
-        "Deviceid": notification_data.get("Deviceid", "546546"),
-        "Udid": notification_data.get("Udid", "6564"),
-        "Operation": "CRNOT",
-        "sap-client": "800"
-    }
-    
-    # Get credentials from environment variables
-    username = os.getenv("SAP_USERNAME")
-    password = os.getenv("SAP_PASSWORD")
-    
-    if not username or not password:
-        raise ValueError("SAP credentials not found in environment variables")
-    
     # Prepare query parameters
     params = {
         "sap-language": "EN",
         "sap-client": "800"
     }
     
-    timeout = aiohttp.ClientTimeout(total=60)  # 60 second timeout
-    async with aiohttp.ClientSession(timeout=timeout, cookies=cookies) as session:
+    session = await _get_session()
+    for attempt in range(2):
+        # Get CSRF token and cookies, reusing the cached ones when still valid
+        csrf_token, cookies = await _get_cached_csrf()
+        headers = dict(_HEADERS_CREATE_BASE)
+        headers["x-csrf-token"] = csrf_token  # Note: Using lowercase as per SAP's requirements
+        for key in ("IvUser", "Muser", "Deviceid", "Udid"):
+            if key in notification_data:
+                headers[key] = notification_data[key]
+        
         try:
-            async with session.post(
+            async with _request_with_retry(
+                session,
+                "POST",
                 url,
                 params=params,
-                json=notification_data,
-                auth=aiohttp.BasicAuth(username, password),
+                data=orjson.dumps(notification_data),
+                auth=_get_auth(),
                 headers=headers,
-                ssl=False  # Note: In production, you should properly handle SSL
+                cookies=cookies,
+                idempotent=False
             ) as response:
-                if response.status != 201:  # 201 Created
-                    error_text = await response.text()
-                    raise Exception(f"SAP API request failed with status {response.status}: {error_text}")
+                if (
+                    response.status == 403
+                    and response.headers.get("x-csrf-token", "").lower() == "required"
+                    and attempt == 0
+                ):
+                    # Cached token was rejected, fetch a fresh one and retry once
+                    _invalidate_csrf(csrf_token)
+                    continue
                 
-                return await response.json()
-        except asyncio.TimeoutError:
-            raise Exception("Request timed out after 60 seconds")
-        except Exception as e:
-            raise Exception(f"Error making request to SAP API: {str(e)}")
+                await _check_status(response, 201, idempotent=False)  # 201 Created
+                
+                return orjson.loads(await response.read())
+        except asyncio.TimeoutError as e:
+            raise SAPUncertainError("Request timed out after 60 seconds") from e
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            raise SAPUncertainError(f"Error making request to SAP API: {e}") from e
+
+async def _get_cached_csrf():
+    """Get the cached CSRF token and cookies, fetching new ones once expired."""
+    async with _csrf_lock:
+        if (
+            _csrf_cache["token"]
+            and time.monotonic() - _csrf_cache["ts"] < CSRF_TOKEN_TTL
+        ):
+            return _csrf_cache["token"], _csrf_cache["cookies"]
+        
+        token, cookies = await get_csrf_token()
+        _csrf_cache.update(token=token, cookies=cookies, ts=time.monotonic())
+        return token, cookies
+
+def _invalidate_csrf(token: str) -> None:
+    """Drop the cached CSRF token unless it has already been replaced."""
+    if _csrf_cache["token"] == token:
+        _csrf_cache.update(token=None, cookies=None, ts=0.0)
 
 async def get_csrf_token() -> str:
     """Get CSRF token from SAP system."""
     url = f"{SAP_BASE_URL}/"
     
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "x-csrf-token": "fetch",
-        "sap-client": "800"
-    }
-    
-    # Get credentials from environment variables
-    username = os.getenv("SAP_USERNAME")
-    password = os.getenv("SAP_PASSWORD")
-    
-    if not username or not password:
-        raise ValueError("SAP credentials not found in environment variables")
-    
-    timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(
-                url,
-                auth=aiohttp.BasicAuth(username, password),
-                headers=headers,
-                ssl=False  # Note: In production, you should properly handle SSL
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to get CSRF token: {error_text}")
-                
-                # Get the token from response headers
-                token = response.headers.get("x-csrf-token")
-                if not token:
-                    raise Exception("CSRF token not found in response headers")
-                
-                # Get cookies for session
-                cookies = response.cookies
-                
-                return token, cookies
-        except asyncio.TimeoutError:
-            raise Exception("Request for CSRF token timed out after 30 seconds")
-        except Exception as e:
-            raise Exception(f"Error getting CSRF token: {str(e)}")
+    session = await _get_session()
+    try:
+        async with _request_with_retry(
+            session,
+            "GET",
+            url,
+            auth=_get_auth(),
+            headers=_HEADERS_CSRF_FETCH,
+            timeout=aiohttp.ClientTimeout(total=30)  # 30 second timeout
+        ) as response:
+            await _check_status(response)
+            
+            # Get the token from response headers
+            token = response.headers.get("x-csrf-token")
+            if not token:
+                raise SAPBadResponseError(response.status, "CSRF token not found in response headers")
+            
+            # Get cookies for session
+            cookies = response.cookies
+            
+            return token, cookies
+    except asyncio.TimeoutError as e:
+        raise SAPTransientError("Request for CSRF token timed out after 30 seconds") from e
+    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+        raise SAPTransientError(f"Error getting CSRF token: {e}") from e
 
 @app.tool("get_notification_details")
 async def get_notification_details(notification_id: str) -> Dict[str, Any]:
@@ -216,45 +531,74 @@ async def get_notification_details(notification_id: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing the notification details
     """
-    url = f"{SAP_BASE_URL}{ENDPOINT}('{notification_id}')"
+    return await _get_notification_details(notification_id)
+
+@app.tool("get_notifications_bulk")
+async def get_notifications_bulk(notification_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get detailed information for several notifications concurrently.
     
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json;charset=UTF-8",
-        "IvUser": "ENST1",
-        "IvTransmitType": "LOAD",
-        "Muser": "ENST1",
-        "Deviceid": "546546",
-        "Udid": "6564",
-        "Operation": "DUNOT"
-    }
+    Args:
+        notification_ids: The IDs of the notifications to fetch
     
-    # Get credentials from environment variables
-    username = os.getenv("SAP_USERNAME")
-    password = os.getenv("SAP_PASSWORD")
+    Returns:
+        List of notification details in the same order as the IDs; failed
+        lookups are returned as {"notification_id": ..., "error": ...}
+    """
+    sem = asyncio.Semaphore(BULK_CONCURRENCY)
     
-    if not username or not password:
-        raise ValueError("SAP credentials not found in environment variables")
+    async def fetch_one(notification_id: str) -> Dict[str, Any]:
+        async with sem:
+            return await _get_notification_details(notification_id)
     
-    timeout = aiohttp.ClientTimeout(total=60)  # 60 second timeout
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(
-                url,
-                auth=aiohttp.BasicAuth(username, password),
-                headers=headers,
-                ssl=False  # Note: In production, you should properly handle SSL
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"SAP API request failed with status {response.status}: {error_text}")
-                
-                return await response.json()
-        except asyncio.TimeoutError:
-            raise Exception("Request timed out after 60 seconds")
-        except Exception as e:
-            raise Exception(f"Error making request to SAP API: {str(e)}")
+    results = await asyncio.gather(
+        *map(fetch_one, notification_ids),
+        return_exceptions=True
+    )
+    return [
+        {"notification_id": notification_id, "error": str(result)}
+        if isinstance(result, BaseException) else result
+        for notification_id, result in zip(notification_ids, results)
+    ]
+
+async def _get_notification_details(notification_id: str) -> Dict[str, Any]:
+    """Fetch a single notification by ID."""
+    # Double single quotes per OData literal rules, then percent-encode the key
+    safe_id = urllib.parse.quote(notification_id.replace("'", "''"), safe="")
+    url = f"{SAP_BASE_URL}{ENDPOINT}('{safe_id}')"
+    
+    session = await _get_session()
+    try:
+        async with _request_with_retry(
+            session,
+            "GET",
+            url,
+            auth=_get_auth(),
+            headers=_HEADERS_DUNOT
+        ) as response:
+            await _check_status(response)
+            
+            return await _read_json_bounded(response)
+    except asyncio.TimeoutError as e:
+        raise SAPTransientError("Request timed out after 60 seconds") from e
+    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+        raise SAPTransientError(f"Error making request to SAP API: {e}") from e
+
+async def _serve() -> None:
+    """Run the SSE server and release the shared session on shutdown."""
+    try:
+        await app.run_async(transport="sse")
+    finally:
+        await _close_session()
 
 if __name__ == "__main__":
-    # Run the server
-    app.run(transport="sse") 
\ No newline at end of file
+    # Fail fast on missing credentials
+    _get_auth()
+    
+    # Run the server, on uvloop when available (it isn't on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(_serve())
+    else:
+        uvloop.run(_serve()) 
\ No newline at end of file